@@ -1,4 +1,5 @@
-from app.core.crypto_service import CryptoService
+import base64
+from app.core.crypto_service import CryptoService, RSATokenScheme
 
 #load backend key
 with open("app/keys/public.pem", "rb") as f:
@@ -6,9 +7,9 @@ with open("app/keys/public.pem", "rb") as f:
 
 class CryptoAuthService:
     def __init__(self):
-        self.crypto = CryptoService(PUBLIC_KEY)
+        self.crypto = CryptoService(RSATokenScheme(PUBLIC_KEY))
 
     def verify_signature(self, payload: dict, signature: str) -> bool:
         import json
         message_bytes = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
-        return self.crypto.verify_signature(message_bytes, signature)
\ No newline at end of file
+        return self.crypto.scheme.verify(message_bytes, base64.b64decode(signature))
\ No newline at end of file
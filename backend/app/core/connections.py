@@ -1,9 +1,43 @@
 from fastapi import WebSocket, Depends, Request
-from typing import Set, Dict
+from collections import OrderedDict
+from typing import Set, Dict, Tuple
+import json
+import time
+import uuid
+
+# Unacknowledged messages older than this are dropped from the pending table
+ACK_TIMEOUT_SECONDS = 60
+# Least recently notified channels lose their delivery stats past this many
+MAX_STATS_CHANNELS = 10000
+
+class DeliveryStats:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.delivered = 0
+        self.acked = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def record_ack(self, latency_ms: float):
+        self.acked += 1
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "delivered": self.delivered,
+            "acked": self.acked,
+            "avgLatencyMs": self.total_latency_ms / self.acked if self.acked else None,
+            "maxLatencyMs": self.max_latency_ms if self.acked else None
+        }
 
 class ConnectionManager:
     def __init__(self) -> None:
         self._channels: Dict[str, Set[WebSocket]] = {}
+        self._stats: "OrderedDict[str, DeliveryStats]" = OrderedDict()
+        # message_id -> (channel, monotonic send time)
+        self._pending: Dict[str, Tuple[str, float]] = {}
 
     async def connect(self, channel: str, websocket: WebSocket):
         await websocket.accept()
@@ -14,27 +48,94 @@ class ConnectionManager:
 
     def disconnect(self, channel: str, websocket: WebSocket):
         conns = self._channels.get(channel)
-        
+
         if not conns:
             return
-        
+
         conns.discard(websocket)
         if not conns:
             del self._channels[channel]
 
-    async def broadcast(self, channel: str, message: str):
+    async def broadcast(self, channel: str, message: str) -> int:
+        """Send message to every connection on channel, returns how many sends succeeded"""
         conns = self._channels.get(channel)
-        
+
         if not conns:
-            return
-        
-        for conn in conns:
+            return 0
+
+        delivered = 0
+        for conn in list(conns):
             try:
                 await conn.send_text(message)
+                delivered += 1
             except Exception:
                 self.disconnect(channel, conn)
 
+        return delivered
+
+    async def send_event(self, channel: str, event_type: str, data: dict) -> dict:
+        """
+        Broadcast an event tagged with a message id that terminals ack over the socket
+        Returns the message id and how many live subscribers received it
+        """
+        message_id = uuid.uuid4().hex
+        message = json.dumps({"id": message_id, "type": event_type, "data": data})
+
+        self._expire_pending()
+        sent_at = time.monotonic()
+        delivered = await self.broadcast(channel, message)
+
+        stats = self._stats_for(channel)
+        stats.sent += 1
+        stats.delivered += delivered
+        if delivered:
+            self._pending[message_id] = (channel, sent_at)
+
+        return {"messageId": message_id, "delivered": delivered}
+
+    def ack(self, channel: str, message_id: str):
+        """Record send-to-ack latency for the first ack of a message"""
+        pending = self._pending.get(message_id)
+        if not pending or pending[0] != channel:
+            return
+
+        del self._pending[message_id]
+        latency_ms = (time.monotonic() - pending[1]) * 1000
+        self._stats_for(channel).record_ack(latency_ms)
+
+    def handle_message(self, channel: str, text: str):
+        """Handle a message sent by a terminal, currently only acks"""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+
+        if isinstance(message, dict) and message.get("type") == "ack" and message.get("id"):
+            self.ack(channel, str(message["id"]))
+
+    def stats(self, channel: str) -> dict:
+        stats = self._stats.get(channel, DeliveryStats()).to_dict()
+        stats["subscribers"] = len(self._channels.get(channel, ()))
+        return stats
+
+    def _stats_for(self, channel: str) -> DeliveryStats:
+        """Stats are keyed by client supplied payee ids, so keep an LRU of channels"""
+        stats = self._stats.get(channel)
+        if stats is None:
+            stats = self._stats[channel] = DeliveryStats()
+            if len(self._stats) > MAX_STATS_CHANNELS:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(channel)
+        return stats
+
+    def _expire_pending(self):
+        cutoff = time.monotonic() - ACK_TIMEOUT_SECONDS
+        expired = [message_id for message_id, (_, sent_at) in self._pending.items() if sent_at < cutoff]
+        for message_id in expired:
+            del self._pending[message_id]
+
 manager = ConnectionManager()
 
 async def notify_channel(channel: str, message: str):
-    await manager.broadcast(channel, message)
\ No newline at end of file
+    await manager.broadcast(channel, message)
@@ -1,48 +1,168 @@
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.exceptions import InvalidSignature
+from functools import lru_cache
+from typing import Dict, Optional
 import base64
+import hashlib
+import hmac
 import os
+import time
+from config import TOKEN_SCHEME, TOKEN_HMAC_KEYS, TOKEN_HMAC_KEY_ID, TOKEN_EXPIRE_SECONDS
+
+KEYS_DIR = "app/keys"
+HMAC_MIN_SECRET_BYTES = 32
+
+def _read_key(filename: str) -> bytes:
+    with open(os.path.join(KEYS_DIR, filename), "rb") as f:
+        return f.read()
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("utf-8")
+
+class TokenScheme:
+    """Signs and verifies the random challenge handed out by /api/token"""
+
+    def sign(self, message: bytes) -> bytes:
+        raise NotImplementedError
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        raise NotImplementedError
+
+    def new_message(self) -> bytes:
+        return os.urandom(32)
+
+class RSATokenScheme(TokenScheme):
+    """RSA-2048 PKCS1v15 with SHA256"""
+
+    def __init__(self, public_key_pem: bytes, private_key_pem: Optional[bytes] = None):
+        self.public_key = serialization.load_pem_public_key(public_key_pem)
+        self.private_key = None
+        if private_key_pem:
+            self.private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+
+    def sign(self, message: bytes) -> bytes:
+        return self.private_key.sign(message, padding.PKCS1v15(), hashes.SHA256())
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            self.public_key.verify(signature, message, padding.PKCS1v15(), hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+class Ed25519TokenScheme(TokenScheme):
+    """Ed25519 signatures, keys in app/keys/ed25519_public.pem and ed25519_private.pem"""
+
+    def __init__(self, public_key_pem: bytes, private_key_pem: Optional[bytes] = None):
+        self.public_key = serialization.load_pem_public_key(public_key_pem)
+        self.private_key = None
+        if private_key_pem:
+            self.private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+
+    def sign(self, message: bytes) -> bytes:
+        return self.private_key.sign(message)
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            self.public_key.verify(signature, message)
+            return True
+        except InvalidSignature:
+            return False
+
+class HMACTokenScheme(TokenScheme):
+    """
+    HMAC-SHA256 over "<key_id>.<expires_at>.<nonce>"
+    The key ID allows rotating keys, tokens past expires_at are rejected
+    """
+
+    def __init__(self, keys: Dict[str, bytes], key_id: Optional[str] = None,
+                 expire_seconds: int = TOKEN_EXPIRE_SECONDS):
+        if not keys:
+            raise ValueError("HMAC token scheme requires at least one key")
+        for kid, secret in keys.items():
+            if not kid or "." in kid:
+                raise ValueError(f"Invalid HMAC key id: {kid!r}")
+            if len(secret) < HMAC_MIN_SECRET_BYTES:
+                raise ValueError(f"HMAC key {kid} must be at least {HMAC_MIN_SECRET_BYTES} bytes")
+        self.keys = keys
+        self.key_id = key_id or next(iter(keys))
+        if self.key_id not in keys:
+            raise ValueError(f"Unknown HMAC key id: {self.key_id}")
+        self.expire_seconds = expire_seconds
+
+    @staticmethod
+    def parse_keys(value: str) -> Dict[str, bytes]:
+        """Parse "key_id:hex_secret" pairs separated by commas"""
+        keys = {}
+        for pair in value.split(","):
+            if not pair.strip():
+                continue
+            key_id, sep, secret = pair.strip().partition(":")
+            if not sep or not key_id or not secret:
+                raise ValueError("TOKEN_HMAC_KEYS entries must look like key_id:hex_secret")
+            try:
+                keys[key_id] = bytes.fromhex(secret)
+            except ValueError:
+                raise ValueError(f"HMAC secret for key {key_id} must be hex encoded")
+        return keys
+
+    def new_message(self) -> bytes:
+        expires_at = int(time.time()) + self.expire_seconds
+        return f"{self.key_id}.{expires_at}.{os.urandom(16).hex()}".encode()
+
+    def sign(self, message: bytes) -> bytes:
+        key_id = message.split(b".", 1)[0].decode()
+        return hmac.new(self.keys[key_id], message, hashlib.sha256).digest()
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            key_id, expires_at, _ = message.decode().split(".", 2)
+            expires_at = int(expires_at)
+        except (UnicodeDecodeError, ValueError):
+            return False
+
+        key = self.keys.get(key_id)
+        if key is None or expires_at < time.time():
+            return False
+
+        expected = hmac.new(key, message, hashlib.sha256).digest()
+        return hmac.compare_digest(expected, signature)
+
+@lru_cache(maxsize=None)
+def load_token_scheme(name: str = TOKEN_SCHEME) -> TokenScheme:
+    """
+    Build the configured token scheme once, keys are read from app/keys
+    Called from the app lifespan so a bad configuration fails at startup
+    """
+    if name == "rsa":
+        return RSATokenScheme(_read_key("public.pem"), _read_key("private.pem"))
+    if name == "ed25519":
+        return Ed25519TokenScheme(_read_key("ed25519_public.pem"), _read_key("ed25519_private.pem"))
+    if name == "hmac":
+        return HMACTokenScheme(HMACTokenScheme.parse_keys(TOKEN_HMAC_KEYS), TOKEN_HMAC_KEY_ID)
+    raise ValueError(f"Unknown token scheme: {name}")
 
 def get_crypto_service():
-    with open("app/keys/private.pem", "rb") as f:
-        private_key = f.read()
-    with open("app/keys/public.pem", "rb") as f:
-        public_key = f.read()
-    return CryptoService(public_key, private_key)
+    return CryptoService(load_token_scheme())
 
 class CryptoService:
-    def __init__(self, public_key_pem: bytes, private_key_pem: bytes):
-        self.public_key = serialization.load_pem_public_key(public_key_pem) 
-        self.private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+    def __init__(self, scheme: TokenScheme):
+        self.scheme = scheme
 
-    def verify_signature(self, message: bytes, signature_b64: str) -> bool:
+    def verify_signature(self, message: str, signature_b64: str) -> bool:
         try:
             message = base64.b64decode(message, validate=True)
             signature = base64.b64decode(signature_b64, validate=True)
-            self.public_key.verify(
-                signature,
-                message,
-                padding.PKCS1v15(),
-                hashes.SHA256()
-            )
-            return True
-        except InvalidSignature:
+        except ValueError:
             return False
+        return self.scheme.verify(message, signature)
 
     def generate_token(self) -> dict:
-        message = os.urandom(32)
-
-        signature = self.private_key.sign(
-            message,
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        )
-
-        message_b64 = base64.b64encode(message).decode("utf-8")
-        signature_b64 = base64.b64encode(signature).decode("utf-8")
+        message = self.scheme.new_message()
+        signature = self.scheme.sign(message)
 
         return {
-            "message": message_b64,
-            "signature": signature_b64
-        }
\ No newline at end of file
+            "message": _b64encode(message),
+            "signature": _b64encode(signature)
+        }
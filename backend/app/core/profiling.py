@@ -0,0 +1,144 @@
+import cProfile
+import functools
+import hmac
+import inspect
+import json
+import os
+import pstats
+import random
+import sys
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, List, Optional
+from fastapi.routing import APIRoute
+from config import PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_ADMIN_TOKEN
+
+PROFILE_HEADER = b"x-profile"
+# Before 3.12 cProfile hooks a single thread, from 3.12 one profiler sees every thread
+PER_THREAD_PROFILER = sys.version_info < (3, 12)
+
+# cProfile cannot run two profilers on the event loop thread at once: on 3.11 the
+# second one silently takes over the hook, so only one request is profiled at a time
+_profiling_active = False
+
+class RequestProfile:
+    """cProfile data for one request, one profiler per thread that ran its code"""
+
+    def __init__(self) -> None:
+        self.profilers: List[cProfile.Profile] = []
+        # CPU time of the threadpool threads that ran sync handlers for this request
+        self.handler_cpu_ms = 0.0
+
+    def start(self) -> cProfile.Profile:
+        """Enable a profiler for the calling thread"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        self.profilers.append(profiler)
+        return profiler
+
+    def dump(self, path: Path):
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(str(path))
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+def profiled(endpoint: Callable) -> Callable:
+    """
+    Sync handlers run in the threadpool, out of reach of the profiler enabled on the
+    event loop, so profile them in their worker thread when the request is profiled
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+
+        profiler = profile.start() if PER_THREAD_PROFILER else None
+        cpu_start = time.thread_time()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            if profiler:
+                profiler.disable()
+            profile.handler_cpu_ms += (time.thread_time() - cpu_start) * 1000
+
+    return wrapper
+
+class ProfiledRoute(APIRoute):
+    """Route class for app/routes/* routers so sync handlers are profiled too"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-request profiling, enabled by the admin X-Profile header or sampling
+    Writes one cProfile .prof file per profiled request to PROFILE_DIR, with a .json
+    sidecar holding wall time and CPU time of the event loop and handler threads
+    Async code on the event loop of concurrently running requests may show up too
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 admin_token: Optional[str] = PROFILE_ADMIN_TOKEN, output_dir: Path = PROFILE_DIR):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode() if admin_token else None
+        self.output_dir = Path(output_dir)
+
+    def _should_profile(self, scope) -> bool:
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.admin_token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        global _profiling_active
+
+        if scope["type"] != "http" or _profiling_active or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        _profiling_active = True
+        profile = RequestProfile()
+        reset_token = _current_profile.set(profile)
+        wall_start = time.perf_counter()
+        # Event loop thread CPU, includes other coroutines that ran during the request
+        loop_cpu_start = time.thread_time()
+        profiler = profile.start()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            _profiling_active = False
+            _current_profile.reset(reset_token)
+            timings = {
+                "wall_ms": (time.perf_counter() - wall_start) * 1000,
+                "loop_cpu_ms": (time.thread_time() - loop_cpu_start) * 1000,
+                "handler_cpu_ms": profile.handler_cpu_ms
+            }
+            self._write(scope, profile, timings)
+
+    def _write(self, scope, profile: RequestProfile, timings: dict):
+        route = scope["path"].strip("/").replace("/", "_") or "root"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{route}-{os.urandom(2).hex()}"
+
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"{name}.prof"
+            profile.dump(path)
+            with open(self.output_dir / f"{name}.json", "w") as f:
+                json.dump({"method": scope["method"], "path": scope["path"], **timings}, f, indent=2)
+            print(
+                f"Profiled {scope['method']} {scope['path']}: wall {timings['wall_ms']:.1f}ms, "
+                f"loop cpu {timings['loop_cpu_ms']:.1f}ms, handler cpu {timings['handler_cpu_ms']:.1f}ms -> {path}"
+            )
+        except Exception as e:
+            print(f"Error writing profile: {e}")
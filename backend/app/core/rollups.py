@@ -0,0 +1,107 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+import time
+from config import ROLLUP_WINDOWS, ROLLUP_MAX_PAYEES
+
+class WindowRollup:
+    """
+    Ring of fixed-width tumbling buckets stored in flat arrays
+    The sliding window total is the sum of the buckets still inside the ring
+    """
+
+    def __init__(self, width: int, windows: int) -> None:
+        self.width = width
+        self.windows = windows
+        self.starts = array("q", [-1] * windows)
+        self.counts = array("L", [0] * windows)
+        self.amounts = array("d", [0.0] * windows)
+
+    def add(self, timestamp: float, amount: float):
+        index = int(timestamp // self.width)
+        slot = index % self.windows
+        if self.starts[slot] != index:
+            self.starts[slot] = index
+            self.counts[slot] = 0
+            self.amounts[slot] = 0.0
+        self.counts[slot] += 1
+        self.amounts[slot] += amount
+
+    def snapshot(self, now: float) -> dict:
+        current = int(now // self.width)
+        oldest = current - self.windows + 1
+        buckets = []
+        count = 0
+        amount = 0.0
+
+        for slot in range(self.windows):
+            index = self.starts[slot]
+            if oldest <= index <= current:
+                buckets.append({
+                    "start": index * self.width,
+                    "count": self.counts[slot],
+                    "amount": self.amounts[slot]
+                })
+                count += self.counts[slot]
+                amount += self.amounts[slot]
+
+        buckets.sort(key=lambda bucket: bucket["start"])
+        latest = buckets[-1] if buckets and buckets[-1]["start"] == current * self.width else None
+
+        return {
+            "current": {
+                "start": current * self.width,
+                "count": latest["count"] if latest else 0,
+                "amount": latest["amount"] if latest else 0.0
+            },
+            "sliding": {
+                "seconds": self.width * self.windows,
+                "count": count,
+                "amount": amount
+            },
+            "buckets": buckets
+        }
+
+class PayeeRollup:
+    def __init__(self, windows: int) -> None:
+        self.minute = WindowRollup(60, windows)
+        self.hour = WindowRollup(3600, windows)
+
+    def add(self, timestamp: float, amount: float):
+        self.minute.add(timestamp, amount)
+        self.hour.add(timestamp, amount)
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "minute": self.minute.snapshot(now),
+            "hour": self.hour.snapshot(now)
+        }
+
+class TransferAggregator:
+    """In-memory per-payee transfer rollups fed by make_transfer"""
+
+    def __init__(self, windows: int = ROLLUP_WINDOWS, max_payees: int = ROLLUP_MAX_PAYEES) -> None:
+        if windows < 1:
+            raise ValueError(f"ROLLUP_WINDOWS must be at least 1, got {windows}")
+        if max_payees < 1:
+            raise ValueError(f"ROLLUP_MAX_PAYEES must be at least 1, got {max_payees}")
+        self.windows = windows
+        self.max_payees = max_payees
+        self._payees: "OrderedDict[str, PayeeRollup]" = OrderedDict()
+
+    def record(self, payee_id: str, amount: float, timestamp: Optional[float] = None):
+        rollup = self._payees.get(payee_id)
+        if rollup is None:
+            rollup = self._payees[payee_id] = PayeeRollup(self.windows)
+            if len(self._payees) > self.max_payees:
+                self._payees.popitem(last=False)
+        else:
+            self._payees.move_to_end(payee_id)
+
+        rollup.add(time.time() if timestamp is None else timestamp, amount)
+
+    def snapshot(self, payee_id: str, now: Optional[float] = None) -> Dict[str, dict]:
+        rollup = self._payees.get(payee_id) or PayeeRollup(self.windows)
+        return rollup.snapshot(time.time() if now is None else now)
+
+aggregator = TransferAggregator()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 
 class LoginRequest(BaseModel):
     nickname: str
@@ -38,3 +38,6 @@ class CreateAccountRequest(BaseModel):
     nickname: str
     rewards: int = 0
     balance: int = 0
+
+class BulkCreateAccountRequest(BaseModel):
+    accounts: List[CreateAccountRequest] = Field(..., min_length=1, max_length=10)
@@ -11,8 +11,9 @@ from app.services.nessie_service import NessieService
 from app.core.auth import create_access_token
 import hashlib
 import secrets
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/api/auth", tags=["auth"])
+router = APIRouter(prefix="/api/auth", tags=["auth"], route_class=ProfiledRoute)
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
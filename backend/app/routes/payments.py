@@ -1,19 +1,27 @@
 import json
 from fastapi import APIRouter, HTTPException, WebSocket, Depends
+from starlette.concurrency import run_in_threadpool
 from app.services.client import API_KEY
 from app.models.paymentModels import DepositRequest, TransferRequest
-from app.models.authModels import CreateAccountRequest
+from app.models.authModels import CreateAccountRequest, BulkCreateAccountRequest
 from app.services.nessie_service import NessieService
 from app.core.auth import get_current_user
 from datetime import date
 from typing import Optional
 from ..core.connections import manager
+from ..core.rollups import aggregator
+from config import ROLLUP_PUSH
 from ..core.crypto_service import CryptoService, get_crypto_service
+from ..core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/api/payments", tags=["payments"])
+router = APIRouter(prefix="/api/payments", tags=["payments"], route_class=ProfiledRoute)
 
 @router.post("/transfer")
-async def make_transfer(body: TransferRequest, crypto_service: CryptoService = Depends(get_crypto_service)):
+async def make_transfer(
+    body: TransferRequest,
+    crypto_service: CryptoService = Depends(get_crypto_service),
+    report_delivery: bool = False
+):
     token = body.secureToken
 
     if not crypto_service.verify_signature(token.message, token.signature):
@@ -40,23 +48,52 @@ async def make_transfer(body: TransferRequest, crypto_service: CryptoService = D
             )
         '''
 
-        await manager.broadcast(f"single/{body.payee_id}", json.dumps({
-            "type": "transfer-received",
-            "data": {
-                "amount": body.amount,
-                "concept": body.concept,
-                "payer": "Fabrizio Vanzani"
-            }
-        }))
+        aggregator.record(body.payee_id, body.amount)
+
+        delivery = await manager.send_event(f"single/{body.payee_id}", "transfer-received", {
+            "amount": body.amount,
+            "concept": body.concept,
+            "payer": "Fabrizio Vanzani"
+        })
         
-        return {
+        response = {
             "success":True,
             "result": "Transfer successful"
         }
+
+        if ROLLUP_PUSH:
+            await manager.broadcast(f"single/{body.payee_id}", json.dumps({
+                "type": "stats-updated",
+                "data": aggregator.snapshot(body.payee_id)
+            }))
+
+        if report_delivery:
+            response["delivery"] = {
+                "messageId": delivery["messageId"],
+                "subscriberOnline": delivery["delivered"] > 0
+            }
+
+        return response
     
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Error performing transfer: {e}")
 
+@router.get("/stats/{payee_id}")
+async def get_payee_stats(payee_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Get per-minute and per-hour transfer count and amount for one of the user's accounts
+    """
+    account = await run_in_threadpool(NessieService.get_account, payee_id)
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if account.get("customer_id") != current_user.get("customer_id"):
+        raise HTTPException(status_code=403, detail="Account does not belong to the current user")
+
+    return {
+        "success": True,
+        "result": aggregator.snapshot(payee_id)
+    }
+
 @router.get("/accounts")
 def get_all_accounts(
     current_user: dict = Depends(get_current_user),
@@ -122,11 +159,63 @@ def create_account(customer_id: str, body: CreateAccountRequest):
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Error creating account: {e}")
 
+@router.post("/customers/{customer_id}/accounts/batch")
+def create_accounts(customer_id: str, body: BulkCreateAccountRequest):
+    """
+    Create several accounts for a customer in a single request
+    """
+    account_ids = NessieService.create_accounts(
+        customer_id=customer_id,
+        accounts=[
+            {
+                "account_type": account.type,
+                "nickname": account.nickname,
+                "rewards": account.rewards,
+                "balance": account.balance
+            }
+            for account in body.accounts
+        ]
+    )
+
+    results = [
+        {
+            "success": account_id is not None,
+            "nickname": account.nickname,
+            "objectCreated": {"_id": account_id} if account_id else None
+        }
+        for account, account_id in zip(body.accounts, account_ids)
+    ]
+    created = sum(1 for result in results if result["success"])
+
+    if not created:
+        raise HTTPException(
+            status_code=400,
+            detail="Failed to create accounts"
+        )
+
+    return {
+        "success": created == len(results),
+        "message": f"Created {created} of {len(results)} accounts",
+        "results": results
+    }
+
+@router.get("/ws/terminal/single/{payee_id}/stats")
+async def get_delivery_stats(payee_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Get notification delivery counts and send-to-ack latency for a terminal
+    """
+    return {
+        "success": True,
+        "result": manager.stats(f"single/{payee_id}")
+    }
+
 @router.websocket("/ws/terminal/single/{payee_id}")
 async def websocket_endpoint(websocket: WebSocket, payee_id: str):
-    await manager.connect(f"single/{payee_id}", websocket)
+    channel = f"single/{payee_id}"
+    await manager.connect(channel, websocket)
     try:
         while True:
-            _ = await websocket.receive_text()
+            text = await websocket.receive_text()
+            manager.handle_message(channel, text)
     except Exception:
-        manager.disconnect(f"single/{payee_id}", websocket)
\ No newline at end of file
+        manager.disconnect(channel, websocket)
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from app.core.auth import get_current_user
 from app.services.nessie_service import NessieService
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/api/protected", tags=["protected"])
+router = APIRouter(prefix="/api/protected", tags=["protected"], route_class=ProfiledRoute)
 
 @router.get("/me")
 async def get_me(current_user: dict = Depends(get_current_user)):
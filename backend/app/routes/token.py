@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from typing import Annotated    
 from ..core.crypto_service import CryptoService, get_crypto_service
+from ..core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/api/token", tags=["token"])
+router = APIRouter(prefix="/api/token", tags=["token"], route_class=ProfiledRoute)
 
 @router.post("/")
 def get_token(crypto_service: Annotated[CryptoService, Depends(get_crypto_service)]):
@@ -4,8 +4,9 @@ from app.core.database import create_user
 from app.services.nessie_service import NessieService
 import hashlib
 import secrets
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(prefix="/api/users", tags=["users"], route_class=ProfiledRoute)
 
 def hash_password(password: str) -> str:
     """Simple password hashing"""
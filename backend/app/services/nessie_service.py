@@ -1,8 +1,10 @@
 import requests
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 from app.services.client import API_KEY
 
 NESSIE_BASE_URL = "http://api.nessieisreal.com"
+MAX_CONCURRENT_REQUESTS = 4
 
 class NessieService:
     """Service for interacting with the Nessie API"""
@@ -69,6 +71,22 @@ class NessieService:
             print(f"Error creating account: {e}")
             return None
     
+    @staticmethod
+    def create_accounts(customer_id: str, accounts: List[Dict[str, Any]],
+                        max_concurrency: int = MAX_CONCURRENT_REQUESTS) -> List[Optional[str]]:
+        """
+        Create several accounts for a customer concurrently
+        Returns a list of account_ids (None for failures) in the same order as accounts
+        """
+        if not accounts:
+            return []
+
+        def create(account: Dict[str, Any]) -> Optional[str]:
+            return NessieService.create_account(customer_id=customer_id, **account)
+
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(accounts))) as executor:
+            return list(executor.map(create, accounts))
+    
     @staticmethod
     def get_accounts(customer_id: str = None) -> list:
         """
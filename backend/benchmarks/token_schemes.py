@@ -0,0 +1,55 @@
+"""
+Compare sign/verify throughput of the token schemes behind CryptoService
+
+Run from the backend directory:
+    python -m benchmarks.token_schemes [iterations]
+"""
+import os
+import sys
+import timeit
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from app.core.crypto_service import (
+    CryptoService,
+    Ed25519TokenScheme,
+    HMACTokenScheme,
+    RSATokenScheme,
+)
+
+def _pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return public_pem, private_pem
+
+def build_schemes():
+    rsa_public, rsa_private = _pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    ed_public, ed_private = _pem_pair(ed25519.Ed25519PrivateKey.generate())
+
+    return {
+        "rsa": RSATokenScheme(rsa_public, rsa_private),
+        "ed25519": Ed25519TokenScheme(ed_public, ed_private),
+        "hmac": HMACTokenScheme({"bench": os.urandom(32)}),
+    }
+
+def run(iterations: int = 2000):
+    print(f"{'scheme':<10}{'sign/s':>14}{'verify/s':>14}")
+    for name, scheme in build_schemes().items():
+        service = CryptoService(scheme)
+        token = service.generate_token()
+
+        sign_time = timeit.timeit(service.generate_token, number=iterations)
+        verify_time = timeit.timeit(
+            lambda: service.verify_signature(token["message"], token["signature"]),
+            number=iterations
+        )
+        print(f"{name:<10}{iterations / sign_time:>14,.0f}{iterations / verify_time:>14,.0f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,46 @@
+import os
+
+# Server settings used by serve.py, the production entry point
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# serve.py refuses more than one worker while WebSocket channels are kept in process memory
+WORKERS = int(os.getenv("WORKERS", "1"))
+BACKLOG = int(os.getenv("BACKLOG", "2048"))
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", "5"))
+LIMIT_CONCURRENCY = int(os.getenv("LIMIT_CONCURRENCY")) if os.getenv("LIMIT_CONCURRENCY") else None
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() in ("1", "true", "yes")
+
+# WebSocket limits
+WS_MAX_SIZE = int(os.getenv("WS_MAX_SIZE", str(64 * 1024)))
+WS_MAX_QUEUE = int(os.getenv("WS_MAX_QUEUE", "32"))
+WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.getenv("WS_PING_TIMEOUT", "20"))
+
+# Token scheme used by /api/token and /api/payments/transfer: "rsa", "ed25519" or "hmac"
+# ed25519 reads app/keys/ed25519_private.pem and app/keys/ed25519_public.pem, generate them with
+#   openssl genpkey -algorithm ed25519 -out app/keys/ed25519_private.pem
+#   openssl pkey -in app/keys/ed25519_private.pem -pubout -out app/keys/ed25519_public.pem
+TOKEN_SCHEME = os.getenv("TOKEN_SCHEME", "rsa")
+# HMAC keys as "key_id:hex_secret" pairs separated by commas, e.g. "k1:<hex>,k2:<hex>"
+# Key ids must not contain "." and secrets must be at least 32 bytes, generate one with
+#   openssl rand -hex 32
+TOKEN_HMAC_KEYS = os.getenv("TOKEN_HMAC_KEYS", "")
+# Key used to sign new HMAC tokens, defaults to the first key in TOKEN_HMAC_KEYS
+TOKEN_HMAC_KEY_ID = os.getenv("TOKEN_HMAC_KEY_ID")
+TOKEN_EXPIRE_SECONDS = int(os.getenv("TOKEN_EXPIRE_SECONDS", "300"))
+
+# Per-request profiling, see app/core/profiling.py
+# Directory where .prof files are written, open them with e.g. `snakeviz <file>`
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles"))
+# Fraction of requests profiled without the header, 0 disables sampling
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Requests sending `X-Profile: <token>` are profiled, unset disables the header
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+
+# Per-payee transfer rollups, see app/core/rollups.py
+# Buckets kept per granularity and payee, bounds memory to ROLLUP_WINDOWS minutes/hours
+ROLLUP_WINDOWS = int(os.getenv("ROLLUP_WINDOWS", "60"))
+# Least recently active payees are dropped past this many
+ROLLUP_MAX_PAYEES = int(os.getenv("ROLLUP_MAX_PAYEES", "10000"))
+# Push a "stats-updated" message to the payee's terminal after each transfer
+ROLLUP_PUSH = os.getenv("ROLLUP_PUSH", "false").lower() in ("1", "true", "yes")
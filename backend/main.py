@@ -3,6 +3,8 @@ from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import payments, token, auth, users, protected
 from app.core.database import init_db
+from app.core.crypto_service import load_token_scheme
+from app.core.profiling import ProfilingMiddleware
 import uvicorn
 from app.core.connections import ConnectionManager
 
@@ -10,6 +12,7 @@ from app.core.connections import ConnectionManager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    load_token_scheme()
     app.state.manager = ConnectionManager()
     yield
 
@@ -23,6 +26,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+
 app.include_router(payments.router)
 app.include_router(token.router)
 app.include_router(auth.router)
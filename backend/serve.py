@@ -0,0 +1,50 @@
+"""
+Production entry point: uvicorn with uvloop and httptools when installed
+Settings come from config.py, run from the backend directory with `python serve.py`
+"""
+import importlib.util
+import uvicorn
+import config
+
+def is_installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def validate_shared_state():
+    """
+    WebSocket channels, delivery stats and transfer rollups live in process memory.
+    With several workers the payer's POST and the payee terminal's WebSocket can land
+    on different workers and the notification is lost, so refuse to start until
+    that state is shared between processes.
+    """
+    if config.WORKERS > 1:
+        raise SystemExit(
+            f"WORKERS={config.WORKERS} is not supported: WebSocket routing, delivery stats and "
+            "transfer rollups are kept in process memory. Set WORKERS=1."
+        )
+
+def main():
+    validate_shared_state()
+
+    loop = "uvloop" if is_installed("uvloop") else "asyncio"
+    http = "httptools" if is_installed("httptools") else "h11"
+    print(f"Starting {config.WORKERS} worker(s) on {config.HOST}:{config.PORT} (loop={loop}, http={http})")
+
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        workers=config.WORKERS,
+        loop=loop,
+        http=http,
+        backlog=config.BACKLOG,
+        timeout_keep_alive=config.KEEP_ALIVE_TIMEOUT,
+        limit_concurrency=config.LIMIT_CONCURRENCY,
+        ws_max_size=config.WS_MAX_SIZE,
+        ws_max_queue=config.WS_MAX_QUEUE,
+        ws_ping_interval=config.WS_PING_INTERVAL,
+        ws_ping_timeout=config.WS_PING_TIMEOUT,
+        access_log=config.ACCESS_LOG,
+    )
+
+if __name__ == "__main__":
+    main()
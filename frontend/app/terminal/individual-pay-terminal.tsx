@@ -72,6 +72,9 @@ export default function IndividualPayTerminal() {
         console.log("WebSocket message received:", event.data);
         try {
           const message = JSON.parse(event.data);
+          if (message.id) {
+            newWs.send(JSON.stringify({ type: "ack", id: message.id }));
+          }
           if (message.type === "transfer-received") {
             setPaymentData(message.data);
             setModalVisible(true);